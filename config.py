@@ -2,21 +2,26 @@
 import sys
 import os
 
+DEBUG: bool = False # Set True to print resolved paths at startup
+
 # --- Determine the base path for resources ---
 # PyInstaller creates a temp folder and stores path in _MEIPASS (one-file)
 # Otherwise, get the directory of the executable (one-folder) or script
 if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
     # Running in a PyInstaller bundle (one-file)
     base_path = sys._MEIPASS
-    print(f"Running frozen (one-file), base path: {base_path}")
+    if DEBUG:
+        print(f"Running frozen (one-file), base path: {base_path}")
 elif getattr(sys, 'frozen', False):
     # Running in a PyInstaller bundle (one-folder)
     base_path = os.path.dirname(sys.executable)
-    print(f"Running frozen (one-folder), base path: {base_path}")
+    if DEBUG:
+        print(f"Running frozen (one-folder), base path: {base_path}")
 else:
     # Running as a normal Python script
     base_path = os.path.dirname(os.path.abspath(__file__))
-    print(f"Running as script, base path: {base_path}")
+    if DEBUG:
+        print(f"Running as script, base path: {base_path}")
 
 # Game Constants
 SCREEN_WIDTH: int = 1280
@@ -35,7 +40,8 @@ LIGHT_BLUE = (173, 216, 230) # For interaction prompt
 
 # --- Define asset paths relative to the base path ---
 ASSETS_DIR = os.path.join(base_path, 'Assets')
-print(f"ASSETS_DIR resolved to: {ASSETS_DIR}")
+if DEBUG:
+    print(f"ASSETS_DIR resolved to: {ASSETS_DIR}")
 
 IMAGES_DIR = os.path.join(ASSETS_DIR, 'Images')
 MAPS_DIR = os.path.join(ASSETS_DIR, 'Maps')
@@ -46,9 +52,9 @@ FONTS_DIR = os.path.join(ASSETS_DIR, 'Fonts') # Define Fonts dir explicitly
 PIERMASTER_IMAGE: str = os.path.join(IMAGES_DIR, 'piermaster.png')
 PLAYER_IMAGE: str = os.path.join(IMAGES_DIR, 'gentleman.png')
 MAYOR_IMAGE: str = os.path.join(IMAGES_DIR, 'mayor.png')
-HOUSEOWNER_IMAGE: str = os.path.join(IMAGES_DIR, 'houseowner0.png') # Default if needed by Houseowner class
 
 HOUSEOWNER_DEFAULT_IMAGE: str = os.path.join(IMAGES_DIR, 'houseowner0.png')
+HOUSEOWNER_IMAGE: str = HOUSEOWNER_DEFAULT_IMAGE # Default if needed by Houseowner class
 HOUSEOWNER_ONE_IMAGE: str = os.path.join(IMAGES_DIR, 'houseowner1.png')
 HOUSEOWNER_TWO_IMAGE: str = os.path.join(IMAGES_DIR, 'houseowner2.png')
 HOUSEOWNER_THREE_IMAGE: str = os.path.join(IMAGES_DIR, 'houseowner3.png')
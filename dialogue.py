@@ -1,6 +1,14 @@
 # dialogue.py
+import os
 import pygame
+from bisect import bisect_left # Line-break search in layout_text
+from collections import OrderedDict # LRU ordering for the render_textrect cache
+from concurrent.futures import ThreadPoolExecutor # Parallel image decoding in preload_images
+from functools import lru_cache # Build-once dialogue and cutscene tables
+from itertools import accumulate # Running word widths for layout_text
+from types import MappingProxyType # Read-only view of the dialogues table
 from typing import Optional # <-- Import Optional
+from weakref import WeakValueDictionary # Box images shared while any box uses them
 from config import * # Assuming config defines colors like WHITE, BLACK, DARK_GRAY etc.
 import config # <-- Import config to access MAP_MUSIC_PATHS
 
@@ -12,7 +20,227 @@ class TextRectException(Exception): # Inherit from Exception for better practice
     def __str__(self):
         return self.message if self.message else "TextRectException"
 
-def render_textrect(string, font, rect, text_color, background_color, justification=0):
+# --- render_textrect output cache ---
+# Dialogue lines and cutscene sentences are static strings that get shown again and again,
+# so the finished surface is memoized per (text, font, size, colours, justification).
+_TEXTRECT_CACHE: OrderedDict = OrderedDict()
+_TEXTRECT_CACHE_SIZE: int = 256 # Oldest entries are evicted once this many surfaces are cached
+
+def _convert_for_display(surface: pygame.Surface) -> pygame.Surface:
+    """
+    Returns the surface converted to the display's pixel format (keeping per-pixel alpha),
+    so blitting it each frame avoids a format conversion. convert_alpha() needs a display
+    mode to be set, so the surface is returned unchanged before that.
+    """
+    if pygame.display.get_surface() is not None:
+        return surface.convert_alpha()
+    return surface
+
+# --- Shared Font Objects ---
+# Loading a Font reads and parses the font file, so each (name, size) pair is loaded once and shared.
+_FONT_CACHE: dict[tuple[Optional[str], int], pygame.font.Font] = {}
+
+def get_font(name: Optional[str], size: int) -> pygame.font.Font:
+    """
+    Returns a shared Font for the given file name and size, loading it on first use.
+    If the named font can't be loaded, the default Pygame font of that size is used
+    (and remembered under the same key, so the missing file isn't retried).
+    """
+    key = (name, size)
+    font = _FONT_CACHE.get(key)
+    if font is None:
+        try:
+            font = pygame.font.Font(name, size)
+        except (FileNotFoundError, pygame.error):
+            if name is None:
+                raise # The default font itself failed (e.g. pygame.font not initialised); nothing to fall back to
+            print(f"Warning: Font '{name}' not found. Using default Pygame font.")
+            font = _FONT_CACHE.get((None, size)) or pygame.font.Font(None, size)
+            _FONT_CACHE.setdefault((None, size), font)
+        _FONT_CACHE[key] = font
+    return font
+
+# --- Per-font Constant Metrics ---
+# The width of a space and the line spacing never change for a given Font object.
+_FONT_METRICS: dict[pygame.font.Font, tuple[int, int]] = {}
+
+def _get_font_metrics(font: pygame.font.Font) -> tuple[int, int]:
+    """Returns (space_width, line_spacing) for the font, measuring it only once."""
+    metrics = _FONT_METRICS.get(font)
+    if metrics is None:
+        metrics = (font.size(' ')[0], font.get_linesize())
+        _FONT_METRICS[font] = metrics
+    return metrics
+
+def _resolve_font_metrics(font: pygame.font.Font, space_width: Optional[int], line_spacing: Optional[int]) -> tuple[int, int]:
+    """Returns (space_width, line_spacing), filling in whichever was not given from the font's metrics."""
+    if space_width is None or line_spacing is None:
+        font_space_width, font_line_spacing = _get_font_metrics(font)
+        if space_width is None:
+            space_width = font_space_width
+        if line_spacing is None:
+            line_spacing = font_line_spacing
+    return space_width, line_spacing
+
+# --- Per-font Word Widths ---
+# Wrapping measures every word with font.size; the dialogue and cutscene texts reuse the same
+# vocabulary, so each word's width is remembered per font. Whole words rather than single
+# characters are cached, as summed glyph widths would drop the font's kerning.
+_WORD_WIDTHS: dict[pygame.font.Font, dict[str, int]] = {}
+
+def _get_word_widths(font: pygame.font.Font) -> dict[str, int]:
+    """Returns the font's word -> pixel width memo (filled in by the caller)."""
+    widths = _WORD_WIDTHS.get(font)
+    if widths is None:
+        widths = _WORD_WIDTHS[font] = {}
+    return widths
+
+# --- Text Measurement / Layout Split ---
+# Measuring (font.size) is the expensive part of wrapping; choosing line breaks from the
+# measured widths is plain integer arithmetic. prepare_text measures each line of a text once,
+# and a line's words are measured the first time it has to be wrapped, so layout_text can
+# re-wrap the result for any width without measuring anything twice.
+class PreparedText:
+    """A text measured with one font: its lines and their pixel widths (and, once needed, their words')."""
+    __slots__ = ('text', 'font', 'lines', 'line_widths', 'widest_line', 'space_width', 'line_spacing', '_words') # Fixed attributes, no per-instance __dict__
+
+    def __init__(self, text, font, lines, line_widths, space_width, line_spacing):
+        """
+        Args:
+            text (str): The original text.
+            font (pygame.font.Font): The font it was measured with.
+            lines (tuple[str, ...]): The text's lines (hard line breaks).
+            line_widths (tuple[int, ...]): The pixel width of each line.
+            space_width (int): Width of a space in the font.
+            line_spacing (int): Height of one line in the font.
+        """
+        self.text = text
+        self.font = font
+        self.lines = lines
+        self.line_widths = line_widths
+        self.widest_line = max(line_widths, default=0)
+        self.space_width = space_width
+        self.line_spacing = line_spacing
+        self._words = [None] * len(lines) # Per-line word measurements, filled in by words()
+
+    def words(self, index):
+        """
+        Returns (words, word_offsets, widest_width) for one line, measuring its
+        words (memoized per font) on first use. word_offsets[i] is the width of words[:i],
+        each followed by a space.
+        """
+        measured = self._words[index]
+        if measured is None:
+            known_widths = _get_word_widths(self.font)
+            words = tuple(self.lines[index].split(' '))
+            word_widths = []
+            for word in words:
+                word_width = known_widths.get(word)
+                if word_width is None:
+                    word_width = known_widths[word] = self.font.size(word)[0]
+                word_widths.append(word_width)
+            # Running totals, so layout_text can find each line break with a single bisect
+            word_offsets = tuple(accumulate((word_width + self.space_width for word_width in word_widths), initial=0))
+            measured = self._words[index] = (words, word_offsets, max(word_widths))
+        return measured
+
+def prepare_text(string, font, space_width=None, line_spacing=None) -> PreparedText:
+    """
+    Measures a text for layout_text: the width of each of its lines. space_width and
+    line_spacing default to the font's metrics.
+    """
+    space_width, line_spacing = _resolve_font_metrics(font, space_width, line_spacing)
+
+    lines = tuple(string.splitlines())
+    # Blank lines only take up vertical space
+    line_widths = tuple(font.size(line)[0] if line else 0 for line in lines)
+    return PreparedText(string, font, lines, line_widths, space_width, line_spacing)
+
+def layout_text(prepared: PreparedText, width: int) -> list[str]:
+    """
+    Word-wraps a prepared text to the given pixel width: its measured word widths pick
+    each break, and one font.size of the joined line confirms it.
+
+    Returns
+        The list of lines to draw (blank lines included).
+
+    Raises
+        TextRectException if the width can't fit even a single character of a word.
+    """
+    # --- Fast Path ---
+    # Most dialogue has no line wider than the box: then there is nothing to wrap
+    if prepared.widest_line <= width:
+        return list(prepared.lines)
+
+    final_lines = []
+    for index, line_width in enumerate(prepared.line_widths):
+        if line_width <= width:
+            final_lines.append(prepared.lines[index]) # Line fits (or is blank) without wrapping
+            continue
+        words, offsets, widest_width = prepared.words(index)
+        # Words longer than the line width get broken across lines
+        if widest_width >= width:
+            words, offsets = _break_long_words(prepared.font, words, offsets, prepared.space_width, width)
+        # Wrap words to fit the line. Summed word widths say words[start:end] fit while
+        # offsets[end] - offsets[start] < width, so one bisect finds a candidate break
+        font = prepared.font
+        start = 0
+        while start < len(words):
+            end = bisect_left(offsets, offsets[start] + width, start + 1) - 1
+            if end <= start:
+                end = start + 1 # A word always gets at least a line of its own
+            # The sum ignores kerning across the spaces, so check the candidate against the
+            # joined line (with its trailing space, as lines were always measured) and move
+            # the break by a word until it agrees; usually a single font.size call
+            if font.size(' '.join(words[start:end]) + ' ')[0] < width:
+                while end < len(words) and font.size(' '.join(words[start:end + 1]) + ' ')[0] < width:
+                    end += 1
+            else:
+                while end > start + 1:
+                    end -= 1
+                    if font.size(' '.join(words[start:end]) + ' ')[0] < width:
+                        break
+            final_lines.append(' '.join(words[start:end]).rstrip())
+            start = end
+    return final_lines
+
+def _break_long_words(font, words, offsets, space_width, width):
+    """
+    Splits every word too wide for a line of the given width into pieces that fit, and
+    returns the new (words, word_offsets). Each break point is binary-searched, so a long
+    word costs O(log len(word)) font.size calls per piece rather than one per character.
+
+    Raises
+        TextRectException if not even a single character fits in the width.
+    """
+    max_piece_width = width - space_width - 1 # A piece plus its trailing space must stay < width
+    new_words = []
+    new_widths = []
+    for i, word in enumerate(words):
+        word_width = offsets[i + 1] - offsets[i] - space_width
+        while word_width > max_piece_width:
+            # Largest k with font.size(word[:k]) fitting; k = 0 means not even one character does
+            low, high = 0, len(word) - 1
+            while low < high:
+                mid = (low + high + 1) // 2
+                if font.size(word[:mid])[0] <= max_piece_width:
+                    low = mid
+                else:
+                    high = mid - 1
+            if low == 0:
+                raise TextRectException(
+                    f"The word '{word}' can't be broken to fit in the rect width ({width}px)."
+                )
+            new_words.append(word[:low])
+            new_widths.append(font.size(word[:low])[0])
+            word = word[low:]
+            word_width = font.size(word)[0] # Pieces aren't vocabulary, so they aren't memoized
+        new_words.append(word)
+        new_widths.append(word_width)
+    new_offsets = tuple(accumulate((word_width + space_width for word_width in new_widths), initial=0))
+    return tuple(new_words), new_offsets
+
+def render_textrect(string, font, rect, text_color, background_color, justification=0, space_width=None, line_spacing=None, prepared=None):
     """
     Returns a surface containing the passed text string, reformatted
     to fit within the given rect, word-wrapped as necessary. The text
@@ -28,87 +256,156 @@ def render_textrect(string, font, rect, text_color, background_color, justificat
     justification - 0 (default) left-justified
                     1 centered
                     2 right-justified
+    space_width, line_spacing - optional pre-measured font metrics; looked up
+                    (and memoized per font) when not given
+    prepared - optional PreparedText of this string and font (see prepare_text),
+                    so a cache miss skips measuring it again
 
     Returns
-        Surface object with the text drawn onto it.
+        Surface object with the text drawn onto it. Surfaces are cached and
+        shared between calls with the same arguments, so treat them as read-only.
 
     Raises
         TextRectException if the text cannot fit.
     """
-    final_lines = []
-    requested_lines = string.splitlines()
+    # --- Cache Lookup ---
+    cache_key = _textrect_cache_key(string, font, rect, text_color, background_color, justification, space_width, line_spacing, prepared)
+    cached_surface = _get_cached_textrect(cache_key)
+    if cached_surface is not None:
+        return cached_surface
 
-    # --- Word Wrapping Logic ---
-    for requested_line in requested_lines:
-        if font.size(requested_line)[0] > rect.width:
-            words = requested_line.split(' ')
-            # Check for words longer than the line width
-            for word in words:
-                if font.size(word)[0] >= rect.width:
-                    raise TextRectException(
-                        f"The word '{word}' is too long ({font.size(word)[0]}px) to fit in the rect width ({rect.width}px)."
-                    )
-            # Wrap words to fit the line
-            accumulated_line = ""
-            for word in words:
-                test_line = accumulated_line + word + " "
-                # Check if the test line fits within the width
-                if font.size(test_line)[0] < rect.width:
-                    accumulated_line = test_line
-                else:
-                    final_lines.append(accumulated_line.rstrip()) # Add the previous line
-                    accumulated_line = word + " " # Start a new line
-            final_lines.append(accumulated_line.rstrip()) # Add the last accumulated line
-        else:
-            final_lines.append(requested_line) # Line fits without wrapping
+    surface = _draw_textrect(string, font, rect, text_color, background_color, justification, space_width, line_spacing, prepared)
+    return _cache_textrect(cache_key, surface)
+
+def _textrect_cache_key(string, font, rect, text_color, background_color, justification, space_width=None, line_spacing=None, prepared=None) -> tuple:
+    """
+    Builds the _TEXTRECT_CACHE key for a render_textrect call (same arguments). The spacing is
+    resolved first, so leaving it out and passing the font's own metrics share one entry.
+    """
+    if prepared is not None:
+        # A PreparedText is drawn with its own text, font and metrics, whatever else was passed
+        string, font = prepared.text, prepared.font
+        space_width, line_spacing = prepared.space_width, prepared.line_spacing
+    else:
+        space_width, line_spacing = _resolve_font_metrics(font, space_width, line_spacing)
+    return (string, font, rect.width, rect.height, tuple(text_color), tuple(background_color), justification,
+            space_width, line_spacing)
+
+def _get_cached_textrect(cache_key: tuple) -> Optional[pygame.Surface]:
+    """Returns the cached surface for the key (marking it recently used), or None."""
+    surface = _TEXTRECT_CACHE.get(cache_key)
+    if surface is not None:
+        _TEXTRECT_CACHE.move_to_end(cache_key) # Mark as most recently used
+    return surface
+
+def _cache_textrect(cache_key: tuple, surface: pygame.Surface) -> pygame.Surface:
+    """Converts a freshly drawn text surface for display, caches it and returns it."""
+    surface = _convert_for_display(surface)
+    _TEXTRECT_CACHE[cache_key] = surface
+    if len(_TEXTRECT_CACHE) > _TEXTRECT_CACHE_SIZE:
+        _TEXTRECT_CACHE.popitem(last=False) # Evict the least recently used surface
+    return surface
+
+# pygame-ce's Surface.fblits blits a sequence without building a result rect per item;
+# plain pygame only has Surface.blits
+_HAS_FBLITS: bool = hasattr(pygame.Surface, 'fblits')
+
+def _draw_textrect(string, font, rect, text_color, background_color, justification=0, space_width=None, line_spacing=None, prepared=None):
+    """
+    Does the word wrapping and drawing for render_textrect (same arguments), without the
+    cache or display conversion.
+    """
+    # --- Justification ---
+    # Pick the x-offset function once per call rather than re-testing the argument for every line
+    if justification == 0: # Left
+        line_x = lambda text_width: 0
+    elif justification == 1: # Centered
+        line_x = lambda text_width: (rect.width - text_width) // 2
+    elif justification == 2: # Right
+        line_x = lambda text_width: rect.width - text_width
+    else: # Invalid justification
+        raise TextRectException(f"Invalid justification argument: {justification}")
+
+    # --- Measuring and Word Wrapping ---
+    if prepared is None:
+        prepared = prepare_text(string, font, space_width, line_spacing)
+    line_spacing = prepared.line_spacing
+    final_lines = layout_text(prepared, rect.width)
 
     # --- Surface Creation and Text Rendering ---
     surface = pygame.Surface(rect.size, pygame.SRCALPHA) # Use SRCALPHA for transparency
     surface.fill(background_color) # Fill background
 
-    accumulated_height = 0
-    line_spacing = font.get_linesize() # Use font's line spacing
+    # --- Vertical Truncation ---
+    # Every line takes line_spacing pixels, so the number that fit is known before rendering any
+    max_lines = rect.height // line_spacing
+    if len(final_lines) > max_lines:
+        # Optional: Add an indicator like "..." if text overflows vertically
+        # if max_lines > 0: # Check if there was at least one visible line
+        #     ellipsis_surf = font.render("...", True, text_color)
+        #     ellipsis_rect = ellipsis_surf.get_rect(bottomright=(rect.width, max_lines * line_spacing))
+        #     # Blit ellipsis slightly overlapping the last visible line's bottom
+        #     surface.blit(ellipsis_surf, ellipsis_rect)
 
-    for i, line in enumerate(final_lines):
-        if accumulated_height + line_spacing > rect.height:
-            # Optional: Add an indicator like "..." if text overflows vertically
-            # if i > 0: # Check if there was at least one previous line
-            #     prev_line_surf = surface.copy() # Keep previous state
-            #     ellipsis_surf = font.render("...", True, text_color)
-            #     ellipsis_rect = ellipsis_surf.get_rect(bottomright=(rect.width, accumulated_height))
-            #     # Blit ellipsis slightly overlapping the last visible line's bottom
-            #     surface.blit(ellipsis_surf, ellipsis_rect)
+        print(f"Warning: Text truncated. Content height ({(max_lines + 1) * line_spacing}px) exceeds rect height ({rect.height}px).")
+        final_lines = final_lines[:max_lines] # Drop lines that won't fit
 
-            print(f"Warning: Text truncated. Content height ({accumulated_height + line_spacing}px) exceeds rect height ({rect.height}px).")
-            break # Stop rendering lines that won't fit
+    # Blank lines only take up vertical space, so drop them once here; each kept line
+    # remembers its index, which gives its y position
+    visible_lines = [(i, line) for i, line in enumerate(final_lines) if line]
 
-        if line != "":
-            try:
-                tempsurface = font.render(line, True, text_color) # Render with anti-aliasing
-            except pygame.error as e:
-                 raise TextRectException(f"Pygame font rendering error: {e}")
-
-            text_width = tempsurface.get_width()
-            blit_pos_x = 0 # Default to left justification
-
-            # --- Justification Logic ---
-            if justification == 1: # Centered
-                blit_pos_x = (rect.width - text_width) // 2
-            elif justification == 2: # Right
-                blit_pos_x = rect.width - text_width
-            elif justification != 0: # Invalid justification
-                raise TextRectException(f"Invalid justification argument: {justification}")
+    line_blits = [] # (line surface, position) pairs, blitted together after the loop
 
-            surface.blit(tempsurface, (blit_pos_x, accumulated_height))
+    try:
+        for i, line in visible_lines:
+            tempsurface = font.render(line, True, text_color) # Render with anti-aliasing
+            line_blits.append((tempsurface, (line_x(tempsurface.get_width()), i * line_spacing)))
+    except pygame.error as e:
+        raise TextRectException(f"Pygame font rendering error: {e}")
 
-        accumulated_height += line_spacing # Move down for the next line
+    # Blit every line in one call so the loop runs in C rather than once per line in Python
+    if _HAS_FBLITS:
+        surface.fblits(line_blits)
+    else:
+        surface.blits(line_blits, doreturn=False)
 
     return surface
 # --- End of TextRect ---
 
 
+# --- Shared Box Images ---
+# A box's background + border image is never drawn on after it's built (text goes onto a separate
+# composite), so boxes with the same size and colours share one. Held weakly: it's freed with the last box.
+_BOX_IMAGES: WeakValueDictionary = WeakValueDictionary()
+
+def _get_box_image(size, background_color, border_color, border_width, alpha_value) -> pygame.Surface:
+    """Returns the (shared, read-only) background and border surface for a DialogueBox."""
+    converted = pygame.display.get_surface() is not None # Don't hand an unconverted image to later boxes
+    key = (size, tuple(background_color), tuple(border_color), border_width, alpha_value, converted)
+    image = _BOX_IMAGES.get(key)
+    if image is None:
+        # Use SRCALPHA for transparency support
+        image = pygame.Surface(size, pygame.SRCALPHA)
+        # Fill with background color + alpha value (e.g., 200 for semi-transparent)
+        image.fill((*background_color, alpha_value))
+
+        # Draw border onto the image surface using the same alpha value
+        # Note: draw.rect doesn't directly support alpha on the surface it draws *to*,
+        # but the color itself can have alpha which affects how it blends if the
+        # target surface (image) has SRCALPHA.
+        pygame.draw.rect(image, (*border_color, alpha_value), image.get_rect(), border_width)
+        # Match the display format once here rather than converting on every draw() blit.
+        # convert_alpha() rather than convert(), as the box is semi-transparent.
+        image = _convert_for_display(image)
+        _BOX_IMAGES[key] = image
+    return image
+
+
 class DialogueBox(pygame.sprite.Sprite):
     # --- DialogueBox class remains the same ---
+    # Every box currently shown, so they can all be drawn together (see draw_all)
+    _shown_boxes = pygame.sprite.Group()
+
     def __init__(self, game, text, x, y, width=600, height=200, font: Optional[pygame.font.Font] = None, font_size=30, font_name=None):
         super().__init__()
         self.game = game
@@ -121,12 +418,11 @@ class DialogueBox(pygame.sprite.Sprite):
         # Use provided font object if available, otherwise try loading by name/size or default
         if font:
             self.font = font
-        elif font_name:
-            try:
-                self.font = pygame.font.Font(font_name, font_size)
-            except (FileNotFoundError, pygame.error):
-                print(f"Warning: Font '{font_name}' not found. Using default Pygame font.")
-            self.font = pygame.font.Font(None, font_size) # Use default font if specified one fails
+        else:
+            # Shared per (name, size); a missing file, or no name at all, gives the default font
+            self.font = get_font(font_name, font_size)
+        # Constant per font, so measure once here instead of on every render
+        self._space_width, self._line_spacing = _get_font_metrics(self.font)
 
         self.text_color = BLACK # Use constants from config
         # Ensure background_color is RGB before adding alpha
@@ -141,99 +437,153 @@ class DialogueBox(pygame.sprite.Sprite):
         self.active = False # Start inactive
 
         # Internal surfaces
-        self.image = None # Main surface for the box background + border
+        self.image = None # What gets drawn: the box image with the current text composited onto it
+        self._box_image = None # Surface for the box background + border alone
         self.rect = None  # Rect for the main surface position/size
         self.text_surface = None # Surface with the rendered text
         self.text_rect = None # Rect for positioning text *within* the box
+        self._prepared = None # PreparedText of the current text, kept until the text or font changes
 
         self._create_base_surface() # Create background/border surface
         self.update_text(self._text) # Render initial text
 
     def _create_base_surface(self):
         """Creates the background and border surface."""
-        # Use SRCALPHA for transparency support
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        # Fill with background color + alpha value (e.g., 200 for semi-transparent)
         alpha_value = 200 # Adjust 0-255 as needed
-        self.image.fill((*self.background_color, alpha_value))
-
-        # Draw border onto the image surface using the same alpha value
-        # Note: draw.rect doesn't directly support alpha on the surface it draws *to*,
-        # but the color itself can have alpha which affects how it blends if the
-        # target surface (self.image) has SRCALPHA.
-        pygame.draw.rect(self.image, (*self.border_color, alpha_value), self.image.get_rect(), self.border_width)
+        self._box_image = _get_box_image((self.width, self.height), self.background_color, self.border_color, self.border_width, alpha_value)
+        self.image = self._box_image # No text composited yet
 
         self.rect = self.image.get_rect(topleft=(self.x, self.y))
+        # Reused for every text update rather than copying the box image each time
+        self._composite_buffer = self._box_image.copy()
 
-    def _render_text(self):
-        """Renders the current text onto self.text_surface."""
-        # Calculate the area available for text inside padding
+    def _text_area_rect(self) -> Optional[pygame.Rect]:
+        """Returns the rect available for text inside the padding, or None if the padding leaves no room."""
         text_area_width = self.width - (self.padding * 2)
         text_area_height = self.height - (self.padding * 2)
-
         if text_area_width <= 0 or text_area_height <= 0:
+            return None
+        return pygame.Rect(0, 0, text_area_width, text_area_height)
+
+    def _render_text(self):
+        """Renders the current text onto self.text_surface."""
+
+        # Calculate the area available for text inside padding
+        text_render_rect = self._text_area_rect()
+        if text_render_rect is None:
              print("Warning: DialogueBox padding is too large for its dimensions.")
              # Create a small dummy surface to avoid errors
-             self.text_surface = pygame.Surface((1, 1), pygame.SRCALPHA)
-             self.text_rect = self.text_surface.get_rect(topleft=(self.padding, self.padding))
+             self._set_text_surface(pygame.Surface((1, 1), pygame.SRCALPHA))
              return
 
-        text_render_rect = pygame.Rect(0, 0, text_area_width, text_area_height)
-
+        # Inside the try so a text that isn't a string (e.g. None) shows the error fallback instead of raising
         try:
+            # Transparent background for the text surface itself
+            cache_key = _textrect_cache_key(self._text, self.font, text_render_rect, self.text_color, (0, 0, 0, 0), 0,
+                                            self._space_width, self._line_spacing)
+            cached_surface = _get_cached_textrect(cache_key)
+            if cached_surface is not None:
+                self._set_text_surface(cached_surface)
+                return
+
+            # Measure once per text; a re-render (e.g. after the cache evicted it) only re-lays it out
+            prepared = self._prepared
+            if prepared is None or prepared.text != self._text or prepared.font is not self.font:
+                prepared = self._prepared = prepare_text(self._text, self.font, self._space_width, self._line_spacing)
             # Render text using the utility function. Pass SRCALPHA for transparency.
-            self.text_surface = render_textrect(
+            self._set_text_surface(render_textrect(
                 self._text,
                 self.font,
                 text_render_rect,
                 self.text_color,
                 (0, 0, 0, 0), # Transparent background for the text surface itself
-                justification=0
-            )
-            # Position the text surface inside the padding
-            self.text_rect = self.text_surface.get_rect(topleft=(self.padding, self.padding))
-
+                justification=0,
+                space_width=self._space_width,
+                line_spacing=self._line_spacing,
+                prepared=prepared
+            ))
         except TextRectException as e:
             print(f"Error rendering text: {e}")
-            # Fallback: Render an error message
-            error_text = "Error: Text too long or invalid."
-            self.text_surface = self.font.render(error_text, True, self.text_color)
-            # Still position it within padding
-            self.text_rect = self.text_surface.get_rect(topleft=(self.padding, self.padding))
+            self._set_error_text("Error: Text too long or invalid.") # Fallback: Render an error message
         except Exception as e: # Catch other potential errors
              print(f"An unexpected error occurred during text rendering: {e}")
-             # Fallback: Render a generic error message
-             error_text = "Error rendering text."
-             self.text_surface = self.font.render(error_text, True, self.text_color)
-             self.text_rect = self.text_surface.get_rect(topleft=(self.padding, self.padding))
+             self._set_error_text("Error rendering text.") # Fallback: Render a generic error message
+
+    def _set_text_surface(self, text_surface):
+        """Stores the rendered text and positions it inside the padding."""
+        self.text_surface = text_surface
+        self.text_rect = self.text_surface.get_rect(topleft=(self.padding, self.padding))
+        # Neither changes until the next update, so composite them once and draw() is a single blit.
+        # Blitting onto fully transparent pixels copies them, so clearing the buffer resets it to the box image.
+        composite = self._composite_buffer
+        composite.fill((0, 0, 0, 0))
+        composite.blit(self._box_image, (0, 0))
+        composite.blit(self.text_surface, self.text_rect)
+        self.image = composite
 
+    def _set_error_text(self, error_text):
+        """Shows a one-line error message in place of text that failed to render."""
+        self._set_text_surface(_convert_for_display(self.font.render(error_text, True, self.text_color)))
 
-    def update_text(self, new_text):
-        """Updates the text displayed in the box and re-renders it."""
+    def update_text(self, new_text, text_surface=None):
+        """
+        Updates the text displayed in the box and re-renders it.
+        If text_surface is given (e.g. from Dialogue.preshape), it is shown as-is instead.
+        """
+        if text_surface is None and new_text == self._text and self.text_surface is not None:
+            return # Same text is already shown, nothing to re-render
         self._text = new_text
-        self._render_text() # Re-render the text surface
+        if text_surface is not None:
+            self._set_text_surface(text_surface)
+        else:
+            self._render_text() # Re-render the text surface
+
+    def show_dialogue_line(self, dialogue):
+        """
+        Shows the dialogue's current line, using the surface stored on the Dialogue (see
+        Dialogue.render_line), so a line rendered once is never rendered again.
+        If that fails, the line is rendered by update_text (which shows the error text).
+        """
+        text_surface = None
+        text_render_rect = self._text_area_rect()
+        if text_render_rect is not None:
+            try:
+                text_surface = dialogue.render_line(dialogue.current_line, self.font, text_render_rect, self.text_color)
+            except Exception as e:
+                print(f"Warning: Could not render line {dialogue.current_line} of dialogue '{dialogue.name}': {e}")
+        self.update_text(dialogue.get_current_text(), text_surface)
 
     def draw(self, surface):
         """Draws the dialogue box onto the target surface if active."""
-        if self.active and self.image and self.text_surface:
-            # 1. Draw the background/border image
+        if self.active and self.image:
+            # Background, border and text in one pre-composited surface
             surface.blit(self.image, self.rect.topleft)
-            # 2. Draw the text surface onto the target surface,
-            #    offsetting by the box's position and the text's internal padding position.
-            text_screen_pos = (self.rect.x + self.text_rect.x, self.rect.y + self.text_rect.y)
-            surface.blit(self.text_surface, text_screen_pos)
+
+    @classmethod
+    def draw_all(cls, surface):
+        """Draws every shown DialogueBox onto the target surface in a single batched blit."""
+        if _HAS_FBLITS:
+            # Nothing uses the dirty rects Group.draw records, so skip building them
+            surface.fblits([(box.image, box.rect) for box in cls._shown_boxes])
+        else:
+            cls._shown_boxes.draw(surface)
 
     def show(self):
         """Activates the dialogue box."""
         self.active = True
+        DialogueBox._shown_boxes.add(self)
 
     def hide(self):
         """Deactivates the dialogue box."""
         self.active = False
+        DialogueBox._shown_boxes.remove(self)
 
     def toggle(self):
         """Toggles the visibility of the dialogue box."""
-        self.active = not self.active
+        if self.active:
+            self.hide()
+        else:
+            self.show()
 
     @property
     def text(self):
@@ -247,8 +597,13 @@ class DialogueBox(pygame.sprite.Sprite):
 
 
 # --- Dialogue class remains the same ---
+# Every distinct tuple of dialogue lines, so identical dialogues share a single one
+_DIALOGUE_LINES: dict[tuple[str, ...], tuple[str, ...]] = {}
+
 class Dialogue:
     """Represents a sequence of text lines for an NPC."""
+    __slots__ = ('name', 'lines', 'current_line', '_surfaces', '_shape_key') # Fixed attributes, no per-instance __dict__
+
     def __init__(self, name: str, lines: list[str]):
         """
         Args:
@@ -256,8 +611,13 @@ class Dialogue:
             lines (list[str]): A list of text strings for the dialogue.
         """
         self.name = name
-        self.lines = lines
+        # Lines never change at runtime, so store them immutably, sharing one tuple between
+        # dialogues with the same text (e.g. the residents' "Go away!")
+        lines = tuple(lines)
+        self.lines = _DIALOGUE_LINES.setdefault(lines, lines)
         self.current_line = 0 # Index of the currently displayed line
+        self._surfaces = None # Rendered "Name: line" surfaces, filled in by render_line()
+        self._shape_key = None # (font, rect size, colours) the surfaces were rendered for
 
     def get_current_line(self) -> str | None:
         """Returns the current line without advancing."""
@@ -265,6 +625,44 @@ class Dialogue:
             return self.lines[self.current_line]
         return None # Should not happen if reset correctly
 
+    def get_current_text(self) -> str | None:
+        """Returns the current line as shown in the dialogue box, prefixed with the speaker's name."""
+        line = self.get_current_line()
+        if line is None:
+            return None
+        return f"{self.name}: {line}"
+
+    def render_line(self, index, font, rect, text_color, background_color=(0, 0, 0, 0)) -> pygame.Surface:
+        """
+        Returns line index (as shown by get_current_text) rendered with render_textrect,
+        rendering it only the first time. The lines never change, so showing the dialogue
+        again just reuses the stored surfaces; they are all re-rendered only if the font,
+        size or colours differ.
+
+        Raises:
+            TextRectException: If the line can't be fitted into rect.
+        """
+        shape_key = (font, rect.size, tuple(text_color), tuple(background_color))
+        if self._surfaces is None or self._shape_key != shape_key:
+            self._surfaces = [None] * len(self.lines) # Filled in line by line as they're shown
+            self._shape_key = shape_key
+        surface = self._surfaces[index]
+        if surface is None:
+            surface = self._surfaces[index] = render_textrect(
+                f"{self.name}: {self.lines[index]}", font, rect, text_color, background_color
+            )
+        return surface
+
+    def preshape(self, font, rect, text_color, background_color=(0, 0, 0, 0)) -> tuple[pygame.Surface, ...]:
+        """
+        Renders every line up front (see render_line), e.g. before a dialogue whose first
+        showing shouldn't render anything.
+
+        Raises:
+            TextRectException: If a line can't be fitted into rect.
+        """
+        return tuple(self.render_line(index, font, rect, text_color, background_color) for index in range(len(self.lines)))
+
     def next_line(self) -> str | None:
         """Advances to the next line and returns it. Returns None if at the end."""
         self.current_line += 1
@@ -282,10 +680,77 @@ class Dialogue:
         """Resets the dialogue back to the first line."""
         self.current_line = 0
 
+# --- Cutscene Image Cache ---
+# Slide images are loaded on first view rather than at import, keyed by normalised path
+# (and by size, for copies scaled to fill the screen).
+_IMAGE_CACHE: dict[tuple[str, Optional[tuple[int, int]]], pygame.Surface] = {}
+# Paths that failed to load, with the error, so a missing image isn't retried (and reported) on every use
+_IMAGE_ERRORS: dict[str, Exception] = {}
+
+def load_image(path: str, size: Optional[tuple[int, int]] = None) -> pygame.Surface:
+    """
+    Loads an opaque image (e.g. a cutscene background) and converts it for fast blitting.
+    Paths are normalised before caching, so spellings like 'Assets/Images/a.png' and
+    'Assets/Images/./a.png' share one Surface. If size is given, the image smoothscaled
+    to that size is returned, and only that scaled copy is cached.
+
+    Raises:
+        pygame.error / FileNotFoundError if the image cannot be loaded (remembered, so
+        later calls for the same path raise the same error without trying the file again).
+    """
+    key = (os.path.normpath(path), size)
+    image = _IMAGE_CACHE.get(key)
+    if image is None:
+        if key[0] in _IMAGE_ERRORS:
+            raise _IMAGE_ERRORS[key[0]]
+        image = _IMAGE_CACHE.get((key[0], None)) # Scale from a full-size copy if one is already cached
+        if image is None:
+            try:
+                image = pygame.image.load(key[0])
+            except (pygame.error, FileNotFoundError) as e:
+                _IMAGE_ERRORS[key[0]] = e
+                raise
+        _IMAGE_CACHE[key] = image = _convert_image(image, size)
+    return image
+
+def _convert_image(image: pygame.Surface, size: Optional[tuple[int, int]]) -> pygame.Surface:
+    """Converts a decoded image for display (slide backgrounds are opaque) and scales it if size is given."""
+    image = image.convert()
+    if size is not None:
+        image = pygame.transform.smoothscale(image, size)
+    return image
+
+def preload_images(paths, size: Optional[tuple[int, int]] = None) -> None:
+    """
+    Warms the load_image cache for several paths at once. Images not cached yet are
+    decoded in parallel (pygame.image.load releases the GIL while SDL_image decodes),
+    then converted and scaled here, since convert() must run on the main thread.
+    Images that fail to load are reported once and skipped; load_image raises for them again.
+    """
+    # Distinct paths only, leaving out any that already failed (and were reported then)
+    keys = {os.path.normpath(path): path for path in paths if path is not None}
+    keys = {key: path for key, path in keys.items() if key not in _IMAGE_ERRORS}
+    missing = [key for key in keys if (key, size) not in _IMAGE_CACHE and (key, None) not in _IMAGE_CACHE]
+    if len(missing) > 1:
+        with ThreadPoolExecutor(max_workers=min(len(missing), 4), thread_name_prefix="image-load") as executor:
+            futures = [(key, executor.submit(pygame.image.load, key)) for key in missing]
+            for key, future in futures:
+                try:
+                    _IMAGE_CACHE[(key, size)] = _convert_image(future.result(), size)
+                except (pygame.error, FileNotFoundError) as e:
+                    _IMAGE_ERRORS[key] = e # Reported by the load_image call below
+    for path in keys.values():
+        try:
+            load_image(path, size)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Warning: Could not preload image '{path}': {e}")
+
 # --- Cutscene class remains largely the same, ensure it takes lists ---
 class Cutscene:
     # ... (Cutscene class definition) ...
     """Represents a sequence of images and corresponding text lines for a cutscene."""
+    __slots__ = ('music_path', 'image_paths', 'sentences', 'num_slides', '_surfaces', '_shape_key') # Fixed attributes, no per-instance __dict__
+
     def __init__(self, image_paths: list[str | None], sentences: list[str], music_path: Optional[str] = None):
         """
         Args:
@@ -298,181 +763,314 @@ class Cutscene:
         if len(image_paths) != len(sentences):
             raise ValueError("Cutscene image_paths and sentences lists must have the same length.")
         self.music_path = music_path # Store the music path
-        self.image_paths = image_paths
-        self.sentences = sentences
+        # Slides never change at runtime, so store them immutably
+        self.image_paths = tuple(image_paths)
+        self.sentences = tuple(sentences)
         self.num_slides = len(sentences) # Store the total number of slides
+        self._surfaces = None # Rendered sentence surfaces, filled in by preshape()
+        self._shape_key = None # (font, rect size, colours) the surfaces were rendered for
+
+    def get_image(self, index: int, size: Optional[tuple[int, int]] = None) -> Optional[pygame.Surface]:
+        """
+        Returns the image for the given slide, loading it from disk the first time it is needed.
+        Images are shared between all cutscenes by path, so a path repeated on every slide
+        is only decoded once.
+
+        Args:
+            index (int): The slide index.
+            size (Optional[tuple[int, int]]): If given, the image scaled to this size.
+
+        Returns:
+            The converted image Surface, or None if the slide has no image.
+
+        Raises:
+            pygame.error / FileNotFoundError if the image cannot be loaded.
+        """
+        image_path = self.image_paths[index]
+        if image_path is None:
+            return None
+        return load_image(image_path, size)
+
+    def preload(self, size: Optional[tuple[int, int]] = None) -> None:
+        """
+        Loads (and scales, if size is given) every slide image up front, so moving
+        between slides never waits on disk or decoding. Images that fail to load are
+        reported and skipped; get_image raises for them again when their slide is shown.
+        """
+        preload_images(self.image_paths, size)
+
+    def preshape(self, font, rect, text_color, background_color=(0, 0, 0, 0)) -> tuple[pygame.Surface, ...]:
+        """
+        Renders every slide's sentence with render_textrect, once, so moving between
+        slides just swaps in a stored surface. Re-renders only if the font, size or
+        colours differ.
+
+        Raises:
+            TextRectException: If a sentence can't be fitted into rect.
+        """
+        shape_key = (font, rect.size, tuple(text_color), tuple(background_color))
+        if self._surfaces is None or self._shape_key != shape_key:
+            self._surfaces = tuple(
+                render_textrect(sentence, font, rect, text_color, background_color)
+                for sentence in self.sentences
+            )
+            self._shape_key = shape_key
+        return self._surfaces
+
+    def get_text_surface(self, index: int) -> Optional[pygame.Surface]:
+        """Returns the preshaped surface for the given slide's sentence, or None if not preshaped."""
+        if self._surfaces is not None and 0 <= index < len(self._surfaces):
+            return self._surfaces[index]
+        return None
 
 # --- Cleaned dialogues dictionary ---
-dialogues = {
-    # Keeping simple dialogues
-    "door_1_npc": Dialogue("Door1NPC", ["Hello! I live here."]), # Example if used by a tile
-    "rude_npc": Dialogue("RudeNPC", ["Go away! I don't have time for you.", "Leave me alone!"]),
-
-    # --- Dialogue Keys for NPCs (Make sure these match keys used in main.py) ---
-    "pierkeeper_generic": Dialogue("Pierkeeper", ["It's a terrible wreck... The pier is totally gone\n\n....what's that? You say you wish to help?",
-                                                "Go talk to the mayor, perhaps he can fund the repairs!\n\nHis house is to the left."]),
-    "mayor_greeting": Dialogue("Mayor", ["Ah, hello there!", "Fine gentleman, you wish to help with the restoration of the pier?",
-                                         "I see! If you can collect donations from the townsfolk I will help. If you can raise £300, we can provide the rest.", "Hurry!"]),
-    "houseowner0_generic": Dialogue("Resident", ["What's that? You're collecting subscriptions for the pier repairs?\n\nI can gladly offer some money.", 
-                                                 "Step into my house and I'll tell you a story about the great Birthday Storm of 1824."]),
-    # Assign specific keys for each houseowner instance if needed later
-    "houseowner1_dialogue": Dialogue("Resident", ["What's that? You're collecting subscriptions for the pier repairs?\n\nI can gladly offer some money.", 
-                                                  "Step into my house and I'll tell you about the time Turner came to visit."]),
-    "houseowner2_dialogue": Dialogue("Resident", ["What's that? You're collecting subscriptions for the pier repairs?\n\nI can gladly offer some money.", 
-                                                  "Step into my house and I'll tell you a story of what life was like before that wonderful pier."]),
-    "houseowner3_dialogue": Dialogue("Resident", ["Go away!"]),
-    "houseowner4_dialogue": Dialogue("Rude Resident", ["Go away!"]), # For the 4th one
-    "houseowner1_generic": Dialogue("Resident", ["It was such a lovely pier before the storm."]),
-    "houseowner2_generic": Dialogue("Resident", ["I hope they can repair it soon."]),
-    "houseowner3_generic": Dialogue("Resident", ["I have nothing to say."]),
-
-    # --- Add your NEW stories/dialogues here! ---
-    "new_story_npc_1": Dialogue("Mysterious Figure", ["Have you seen the state of the pier?", "Something doesn't feel right about that storm..."]),
-    "shopkeeper_intro": Dialogue("Shopkeeper", ["Welcome!", "Looking for supplies?", "Can't offer much with the pier out of commission."]),
-    # Add more as needed...
-
-    # --- Piermaster Ending Dialogue ---
-    # This key will be assigned to the Piermaster *only* on the 'pier_repaired' map
-    "piermaster_ending": Dialogue("Piermaster", [
-        "You... you actually did it!\n\nWith these funds, we can fully restore the pier to its former glory, maybe even better!",
-        "The town owes you a great debt. Thank you, truly.",
-        "Brighton's connection to the sea, its very heart, is saved thanks to you."
-    ]), # This dialogue finishing will trigger the end state
-}
+# The dialogue and cutscene tables are built on first use (get_dialogue / get_cutscene) rather
+# than at import, and then kept, so every caller gets the same Dialogue/Cutscene objects.
+@lru_cache(maxsize=None)
+def _dialogue_table() -> MappingProxyType:
+    """Builds the dialogue_key -> Dialogue table."""
+    dialogues = {
+        # Keeping simple dialogues
+        "door_1_npc": Dialogue("Door1NPC", ["Hello! I live here."]), # Example if used by a tile
+        "rude_npc": Dialogue("RudeNPC", ["Go away! I don't have time for you.", "Leave me alone!"]),
+
+        # --- Dialogue Keys for NPCs (Make sure these match keys used in main.py) ---
+        "pierkeeper_generic": Dialogue("Pierkeeper", ["It's a terrible wreck... The pier is totally gone\n\n....what's that? You say you wish to help?",
+                                                    "Go talk to the mayor, perhaps he can fund the repairs!\n\nHis house is to the left."]),
+        "mayor_greeting": Dialogue("Mayor", ["Ah, hello there!", "Fine gentleman, you wish to help with the restoration of the pier?",
+                                             "I see! If you can collect donations from the townsfolk I will help. If you can raise £300, we can provide the rest.", "Hurry!"]),
+        "houseowner0_generic": Dialogue("Resident", ["What's that? You're collecting subscriptions for the pier repairs?\n\nI can gladly offer some money.", 
+                                                     "Step into my house and I'll tell you a story about the great Birthday Storm of 1824."]),
+        # Assign specific keys for each houseowner instance if needed later
+        "houseowner1_dialogue": Dialogue("Resident", ["What's that? You're collecting subscriptions for the pier repairs?\n\nI can gladly offer some money.", 
+                                                      "Step into my house and I'll tell you about the time Turner came to visit."]),
+        "houseowner2_dialogue": Dialogue("Resident", ["What's that? You're collecting subscriptions for the pier repairs?\n\nI can gladly offer some money.", 
+                                                      "Step into my house and I'll tell you a story of what life was like before that wonderful pier."]),
+        "houseowner3_dialogue": Dialogue("Resident", ["Go away!"]),
+        "houseowner4_dialogue": Dialogue("Rude Resident", ["Go away!"]), # For the 4th one
+        "houseowner1_generic": Dialogue("Resident", ["It was such a lovely pier before the storm."]),
+        "houseowner2_generic": Dialogue("Resident", ["I hope they can repair it soon."]),
+        "houseowner3_generic": Dialogue("Resident", ["I have nothing to say."]),
+
+        # --- Add your NEW stories/dialogues here! ---
+        "new_story_npc_1": Dialogue("Mysterious Figure", ["Have you seen the state of the pier?", "Something doesn't feel right about that storm..."]),
+        "shopkeeper_intro": Dialogue("Shopkeeper", ["Welcome!", "Looking for supplies?", "Can't offer much with the pier out of commission."]),
+        # Add more as needed...
+
+        # --- Piermaster Ending Dialogue ---
+        # This key will be assigned to the Piermaster *only* on the 'pier_repaired' map
+        "piermaster_ending": Dialogue("Piermaster", [
+            "You... you actually did it!\n\nWith these funds, we can fully restore the pier to its former glory, maybe even better!",
+            "The town owes you a great debt. Thank you, truly.",
+            "Brighton's connection to the sea, its very heart, is saved thanks to you."
+        ]), # This dialogue finishing will trigger the end state
+    }
+    # Read-only view: the table is fixed once built, so guard it against accidental mutation at runtime
+    return MappingProxyType(dialogues)
+
+def get_dialogue(key: str) -> Optional[Dialogue]:
+    """Returns the Dialogue for an NPC's dialogue_key, or None if there isn't one."""
+    return _dialogue_table().get(key)
+
+# --- Cutscene Asset Paths ---
+# Joined once with os.path.join; paths shared by several slides are a single str,
+# which load_image's cache then looks up by the same object.
+_STORY1_IMAGE: str = os.path.join(IMAGES_DIR, 'story1 copy.jpg')
+_STORY2_IMAGE: str = os.path.join(IMAGES_DIR, 'story2.jpg')
+_STORY3_IMAGE: str = os.path.join(IMAGES_DIR, 'story3.jpg')
+_WAVES_SOUND: str = os.path.join(MUSIC_DIR, 'waves.mp3')
 
 # --- NEW: Dictionary for Collision-Triggered Cutscenes ---
 # The keys (e.g., "story1") MUST match the 'CutsceneTrigger' property values set in Tiled.
-collision_cutscenes: dict[str, Cutscene] = {
-    "intro_story": Cutscene( # Example key, replace with your Tiled value
-        image_paths=[
-            # Note: Corrected path assuming 'cutscenes' subfolder
-            f'{IMAGES_DIR}/cutscenes/intro_slide_1.png',
-            f'{IMAGES_DIR}/cutscenes/intro_slide_2.png',
-            f'{IMAGES_DIR}/cutscenes/intro_slide_3.png',
-            None, # Example: A slide with just text on black background
-        ],
-        music_path=config.MAP_MUSIC_PATHS.get('streets'), # Use 'When The Wind Blows'
-        sentences=[
-            "It is the morning of October 16th in the year of our Lord 1833. A most terrible and violent storm the night prior has left the mighty Chain Pier in a ruinous state.",
-            "The second bridge is hanging down almost touching the sea, a testament to the storm's fury.",
-            "Only the twisted ropes of the third bridge remain, dangling uselessly over the churning waves.",
-            "Work to repair it must be commenced as soon as possible, for without the Pier, the town's lifeline to the sea is severed!"
-        ]
-    ),
-    "another_story": Cutscene( # Example for a second trigger
-         image_paths=[
-             f'{IMAGES_DIR}/cutscenes/another_1.png',
-             f'{IMAGES_DIR}/cutscenes/another_2.png',
-         ],
-        music_path=config.MAP_MUSIC_PATHS.get('streets'), # Use 'When The Wind Blows'
-         sentences=[
-             "This is the first part of another story, triggered by a different collision.",
-             "And this is the concluding slide for that story. Press Enter to return to the game.",
-         ]
-    ),
-
-    # --- STORY1 STORY ONE STORY 1 ---
-    "houseowner1_cutscene": Cutscene(
-        image_paths=[
-            f'{IMAGES_DIR}/story1 copy.jpg', # Slide 1
-            f'{IMAGES_DIR}/story1 copy.jpg', # Slide 2
-            f'{IMAGES_DIR}/story1 copy.jpg', # Slide 3
-            f'{IMAGES_DIR}/story1 copy.jpg', # Slide 4
-            f'{IMAGES_DIR}/story1 copy.jpg', # Slide 5
-            f'{IMAGES_DIR}/story1 copy.jpg', # Slide 6
-            f'{IMAGES_DIR}/story1 copy.jpg'  # Slide 7
-        ],
-        music_path=f'{MUSIC_DIR}/waves.mp3', # Use waves sound
-        sentences=[
-            # Slide 1
-            "Brighton's storms were no strangers—grey, thrashing things that rolled off the Channel like clockwork. But this one, the one they'd later call the Birthday Storm, had teeth.",
-            # Slide 2
-            "The Chain Pier, fresh as a painted toy, shuddered under the waves. My father, drowned in his oilskin coat, barked at sightseers to clear off. They lingered, clutching hats and laughing like it was all a lark.",
-            # Slide 3
-            "Then the lightning. No grand omen—just rotten luck. The bolt ripped into the third tower, splintering wood, snapping chains. Planks tore free, skidding into the churn. The crowd's laughter turned to shrieks.",
-            # Slide 4
-            "Father lunged for a man trapped under the wreckage. A beam gave way. It caught his leg, crushing it flat. I still see it: his knuckles white on the timber, the blood thin and quick in the rain.",
-            # Slide 5
-            "They dragged him home, boot sloshing. The doctor stitched him up, but he walked crooked ever after. The pier? A few gaps in the deck, scorch marks on the towers. Engineers called it a \"miracle,\" muttered about lightning rods.",
-            # Slide 6
-            "Father snorted. \"Birthday Storm,\" he'd grumble, kneading his knee when the air turned salt-thick. \"Sea's just remindin' us who's boss.\" Brighton patched the planks, slapped on fresh paint. Tourists flocked back.",
-            # Slide 7
-            "But whenever the wind snapped, Father's face went taut, his hand gripping the cane like it was the only thing holding him upright. We build. The sea undoes it."
-
-        ]
-
-    ),
-    # -------------------------
-
-    # --- STORY2 STORY TWO STORY 2 ---
-    "houseowner2_cutscene": Cutscene(
-        image_paths=[
-            f'{IMAGES_DIR}/story2.jpg', # Slide 1
-            f'{IMAGES_DIR}/story2.jpg', # Slide 2
-            f'{IMAGES_DIR}/story2.jpg', # Slide 3
-            f'{IMAGES_DIR}/story2.jpg', # Slide 4
-            f'{IMAGES_DIR}/story2.jpg', # Slide 5
-            f'{IMAGES_DIR}/story2.jpg', # Slide 6
-            f'{IMAGES_DIR}/story2.jpg', # Slide 7
-            f'{IMAGES_DIR}/story2.jpg', # Slide 8
-        ],
-        music_path=f'{MUSIC_DIR}/waves.mp3', # Use waves sound
-        sentences=[
-            # Slide 1
-            "The man taps the watercolour above his mantel. \"That's *Brighthelmston* by Turner—1824, just after the pier opened. Come, look closer.\"",
-            # Slide 2
-            "He points to the foreground, where a small boat battles the waves. \"See how he paints the crew? Just smudges of ochre and white, but you *feel* them fighting the swell. Not heroes, just fools in the wrong place. Like most of us.\"",
-            # Slide 3
-            "You squint. The boat's sails twist like crumpled paper.",
-            # Slide 4
-            "\"Now follow the pier.\" His finger trails the iron chains, stark against the storm. \"Brown's design—all geometry and pride. But Turner *mocks* it. See the rainbow?\" A spectral arc glows above the chaos.",
-            # Slide 5
-            "\"Pretty, isn't it? A lie. That's the sublime—beauty that could kill you. The pier's man's answer to the sea. Turner paints the *argument*.\"",
-            # Slide 6
-            "You mutter something about the buildings onshore. \"Ah, the Pavilion!\" He laughs. \"He cheated, turned it sideways to fit the composition. *Picturesque* nonsense. But the details!\"",
-            # Slide 7
-            "He plucks a magnifying glass from her desk. \"St. Nicholas's spire, the Duke of York's Hotel… all here. Even the half-built Marine Parade. History in a storm.\"",
-            # Slide 8
-            "His tone softens. \"The rainbow's the joke, though. We build piers, ships, promenades. Nature builds tempests. Turner knew which'd last.\" He hands you the glass. \"Keep looking. That boat's still sinking.\""
-        ]
-
-    ),
-
-      # --- STORY 3 STORY THREE STORY3 ---
-    "houseowner3_cutscene": Cutscene(
-        image_paths=[
-            f'{IMAGES_DIR}/story3.jpg', # Slide 1 Image
-            f'{IMAGES_DIR}/story3.jpg', # Slide 2 Image
-            f'{IMAGES_DIR}/story3.jpg', # Slide 3 Image
-            f'{IMAGES_DIR}/story3.jpg'  # Slide 4 Image
-        ],
-        music_path=f'{MUSIC_DIR}/waves.mp3', # Use waves sound
-        sentences=[
-            # Slide 1 Text
-            "Ever read Porden's diary from 1802? Crossed to Dieppe on the Eliza—cramped boxes stacked like coffins, he called the cabins. No portholes. Want light? Open your door to the dining room's chaos. Privacy meant sitting in the dark or burning your own candle. Bedding? Haul it yourself—part of your 400-pound allowance. At least officers shared their table, though the return trip made you pack your own food, even after they gouged your coin.",
-            # Slide 2 Text
-            "Porden sketched the layout—'cabinetts stretched too large,' he scribbled. Took 18 hours. Just boarding was a farce: Eleanor, his daughter, green-faced, hauled into a cot while waves tossed their rowboat. Cabins had curtains for decency, but nothing stifled the stench. Boys swapped sick basins like ghosts.",
-            # Slide 3 Text
-            "Miss Appleton, though—poor soul. Puked from Brighton till Dieppe, left forgotten on the ship. Porden called her 'courageous'—a tall, sharp-tongued bluestocking, fluent in French, traveling alone. Carried ashore on a sailor's back, insensible.",
-            # Slide 4 Text
-            "Customs cleared, they limped to the English Hotel. Charged London prices for slop, Porden griped. Imagine it—eighteen hours of retching, then overpaying for gristle. The Chain Pier's cushy ferries? Saints' work compared to this.\" Her smirk was sharp as she jabbed the diary. \"Romantic age, my arse."
-        ]
-    ),
-
-          # --- GO AWAY ---
-    "houseowner4_cutscene": Cutscene(
-        image_paths=[
-            None,
-        ],
-        music_path=f'{MUSIC_DIR}/waves.mp3', # Use waves sound
-        sentences=[
-            # Updated sentence to match image
-            "Go away."
-        ]
-    ),
-    # Add more entries here for each 'CutsceneTrigger' value you defined in Tiled
-    # "story_trigger_3": Cutscene(...)
-}
+@lru_cache(maxsize=None)
+def _cutscene_table() -> MappingProxyType:
+    """Builds the CutsceneTrigger value -> Cutscene table."""
+    collision_cutscenes: dict[str, Cutscene] = {
+        "intro_story": Cutscene( # Example key, replace with your Tiled value
+            image_paths=[
+                # Note: Corrected path assuming 'cutscenes' subfolder
+                os.path.join(IMAGES_DIR, 'cutscenes', 'intro_slide_1.png'),
+                os.path.join(IMAGES_DIR, 'cutscenes', 'intro_slide_2.png'),
+                os.path.join(IMAGES_DIR, 'cutscenes', 'intro_slide_3.png'),
+                None, # Example: A slide with just text on black background
+            ],
+            music_path=config.MAP_MUSIC_PATHS.get('streets'), # Use 'When The Wind Blows'
+            sentences=[
+                "It is the morning of October 16th in the year of our Lord 1833. A most terrible and violent storm the night prior has left the mighty Chain Pier in a ruinous state.",
+                "The second bridge is hanging down almost touching the sea, a testament to the storm's fury.",
+                "Only the twisted ropes of the third bridge remain, dangling uselessly over the churning waves.",
+                "Work to repair it must be commenced as soon as possible, for without the Pier, the town's lifeline to the sea is severed!"
+            ]
+        ),
+        "another_story": Cutscene( # Example for a second trigger
+             image_paths=[
+                 os.path.join(IMAGES_DIR, 'cutscenes', 'another_1.png'),
+                 os.path.join(IMAGES_DIR, 'cutscenes', 'another_2.png'),
+             ],
+            music_path=config.MAP_MUSIC_PATHS.get('streets'), # Use 'When The Wind Blows'
+             sentences=[
+                 "This is the first part of another story, triggered by a different collision.",
+                 "And this is the concluding slide for that story. Press Enter to return to the game.",
+             ]
+        ),
+
+        # --- STORY1 STORY ONE STORY 1 ---
+        "houseowner1_cutscene": Cutscene(
+            image_paths=[
+                _STORY1_IMAGE, # Slide 1
+                _STORY1_IMAGE, # Slide 2
+                _STORY1_IMAGE, # Slide 3
+                _STORY1_IMAGE, # Slide 4
+                _STORY1_IMAGE, # Slide 5
+                _STORY1_IMAGE, # Slide 6
+                _STORY1_IMAGE  # Slide 7
+            ],
+            music_path=_WAVES_SOUND, # Use waves sound
+            sentences=[
+                # Slide 1
+                "Brighton's storms were no strangers—grey, thrashing things that rolled off the Channel like clockwork. But this one, the one they'd later call the Birthday Storm, had teeth.",
+                # Slide 2
+                "The Chain Pier, fresh as a painted toy, shuddered under the waves. My father, drowned in his oilskin coat, barked at sightseers to clear off. They lingered, clutching hats and laughing like it was all a lark.",
+                # Slide 3
+                "Then the lightning. No grand omen—just rotten luck. The bolt ripped into the third tower, splintering wood, snapping chains. Planks tore free, skidding into the churn. The crowd's laughter turned to shrieks.",
+                # Slide 4
+                "Father lunged for a man trapped under the wreckage. A beam gave way. It caught his leg, crushing it flat. I still see it: his knuckles white on the timber, the blood thin and quick in the rain.",
+                # Slide 5
+                "They dragged him home, boot sloshing. The doctor stitched him up, but he walked crooked ever after. The pier? A few gaps in the deck, scorch marks on the towers. Engineers called it a \"miracle,\" muttered about lightning rods.",
+                # Slide 6
+                "Father snorted. \"Birthday Storm,\" he'd grumble, kneading his knee when the air turned salt-thick. \"Sea's just remindin' us who's boss.\" Brighton patched the planks, slapped on fresh paint. Tourists flocked back.",
+                # Slide 7
+                "But whenever the wind snapped, Father's face went taut, his hand gripping the cane like it was the only thing holding him upright. We build. The sea undoes it."
+
+            ]
+
+        ),
+        # -------------------------
+
+        # --- STORY2 STORY TWO STORY 2 ---
+        "houseowner2_cutscene": Cutscene(
+            image_paths=[
+                _STORY2_IMAGE, # Slide 1
+                _STORY2_IMAGE, # Slide 2
+                _STORY2_IMAGE, # Slide 3
+                _STORY2_IMAGE, # Slide 4
+                _STORY2_IMAGE, # Slide 5
+                _STORY2_IMAGE, # Slide 6
+                _STORY2_IMAGE, # Slide 7
+                _STORY2_IMAGE, # Slide 8
+            ],
+            music_path=_WAVES_SOUND, # Use waves sound
+            sentences=[
+                # Slide 1
+                "The man taps the watercolour above his mantel. \"That's *Brighthelmston* by Turner—1824, just after the pier opened. Come, look closer.\"",
+                # Slide 2
+                "He points to the foreground, where a small boat battles the waves. \"See how he paints the crew? Just smudges of ochre and white, but you *feel* them fighting the swell. Not heroes, just fools in the wrong place. Like most of us.\"",
+                # Slide 3
+                "You squint. The boat's sails twist like crumpled paper.",
+                # Slide 4
+                "\"Now follow the pier.\" His finger trails the iron chains, stark against the storm. \"Brown's design—all geometry and pride. But Turner *mocks* it. See the rainbow?\" A spectral arc glows above the chaos.",
+                # Slide 5
+                "\"Pretty, isn't it? A lie. That's the sublime—beauty that could kill you. The pier's man's answer to the sea. Turner paints the *argument*.\"",
+                # Slide 6
+                "You mutter something about the buildings onshore. \"Ah, the Pavilion!\" He laughs. \"He cheated, turned it sideways to fit the composition. *Picturesque* nonsense. But the details!\"",
+                # Slide 7
+                "He plucks a magnifying glass from her desk. \"St. Nicholas's spire, the Duke of York's Hotel… all here. Even the half-built Marine Parade. History in a storm.\"",
+                # Slide 8
+                "His tone softens. \"The rainbow's the joke, though. We build piers, ships, promenades. Nature builds tempests. Turner knew which'd last.\" He hands you the glass. \"Keep looking. That boat's still sinking.\""
+            ]
+
+        ),
+
+          # --- STORY 3 STORY THREE STORY3 ---
+        "houseowner3_cutscene": Cutscene(
+            image_paths=[
+                _STORY3_IMAGE, # Slide 1 Image
+                _STORY3_IMAGE, # Slide 2 Image
+                _STORY3_IMAGE, # Slide 3 Image
+                _STORY3_IMAGE  # Slide 4 Image
+            ],
+            music_path=_WAVES_SOUND, # Use waves sound
+            sentences=[
+                # Slide 1 Text
+                "Ever read Porden's diary from 1802? Crossed to Dieppe on the Eliza—cramped boxes stacked like coffins, he called the cabins. No portholes. Want light? Open your door to the dining room's chaos. Privacy meant sitting in the dark or burning your own candle. Bedding? Haul it yourself—part of your 400-pound allowance. At least officers shared their table, though the return trip made you pack your own food, even after they gouged your coin.",
+                # Slide 2 Text
+                "Porden sketched the layout—'cabinetts stretched too large,' he scribbled. Took 18 hours. Just boarding was a farce: Eleanor, his daughter, green-faced, hauled into a cot while waves tossed their rowboat. Cabins had curtains for decency, but nothing stifled the stench. Boys swapped sick basins like ghosts.",
+                # Slide 3 Text
+                "Miss Appleton, though—poor soul. Puked from Brighton till Dieppe, left forgotten on the ship. Porden called her 'courageous'—a tall, sharp-tongued bluestocking, fluent in French, traveling alone. Carried ashore on a sailor's back, insensible.",
+                # Slide 4 Text
+                "Customs cleared, they limped to the English Hotel. Charged London prices for slop, Porden griped. Imagine it—eighteen hours of retching, then overpaying for gristle. The Chain Pier's cushy ferries? Saints' work compared to this.\" Her smirk was sharp as she jabbed the diary. \"Romantic age, my arse."
+            ]
+        ),
+
+              # --- GO AWAY ---
+        "houseowner4_cutscene": Cutscene(
+            image_paths=[
+                None,
+            ],
+            music_path=_WAVES_SOUND, # Use waves sound
+            sentences=[
+                # Updated sentence to match image
+                "Go away."
+            ]
+        ),
+        # Add more entries here for each 'CutsceneTrigger' value you defined in Tiled
+        # "story_trigger_3": Cutscene(...)
+    }
+    return MappingProxyType(collision_cutscenes)
+
+def get_cutscene(key: str) -> Optional[Cutscene]:
+    """Returns the Cutscene for a 'CutsceneTrigger' value, or None if there isn't one."""
+    return _cutscene_table().get(key)
+
+def prerender_dialogues(box: DialogueBox) -> None:
+    """
+    Renders every line of every dialogue for the given box (see Dialogue.render_line),
+    e.g. at startup, so talking to an NPC never has to rasterize text mid-game.
+    Dialogues that fail are reported and left to render when shown.
+    """
+    text_render_rect = box._text_area_rect()
+    if text_render_rect is None:
+        return
+    for key, dialogue in _dialogue_table().items():
+        try:
+            dialogue.preshape(box.font, text_render_rect, box.text_color)
+        except Exception as e:
+            print(f"Warning: Could not pre-render dialogue '{key}': {e}")
+
+def prerender_cutscenes(font, rect, text_color, background_color=(0, 0, 0, 0)) -> None:
+    """
+    Renders every cutscene's sentences up front (see Cutscene.preshape), e.g. at startup.
+    Cutscenes that fail are reported and left to render their slides when shown.
+    """
+    for key, cutscene in _cutscene_table().items():
+        try:
+            cutscene.preshape(font, rect, text_color, background_color)
+        except Exception as e:
+            print(f"Warning: Could not pre-render cutscene '{key}': {e}")
+
+def preload_cutscene_images(size: Optional[tuple[int, int]] = None) -> None:
+    """
+    Decodes (and scales, if size is given) the cutscene images up front, e.g. at startup.
+    Slides that repeat an image share one Surface. Cutscenes with missing image files
+    (placeholders) are skipped; they load lazily, and report the problem, if ever played.
+    """
+    preload_images([
+        path
+        for cutscene in _cutscene_table().values()
+        if all(path is None or os.path.isfile(path) for path in cutscene.image_paths)
+        for path in cutscene.image_paths
+    ], size)
+
+def __getattr__(name: str):
+    """
+    Module-level attribute hook (PEP 562) so the tables can still be read as
+    dialogue.dialogues / dialogue.collision_cutscenes; building them on first access.
+    """
+    if name == 'dialogues':
+        return _dialogue_table()
+    if name == 'collision_cutscenes':
+        return _cutscene_table()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # --- Cutscene class (from original file, now potentially redundant if using collision_cutscenes) ---
 # You can keep this if you use it elsewhere, or remove it if collision_cutscenes replaces its use case.
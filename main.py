@@ -9,19 +9,19 @@
 # References Local Files:
 #   - config.py: Loads game settings, constants, and file paths (including MAP_MUSIC_PATHS).
 #   - sprites.py: Uses Player and NPC sprite classes defined therein.
-#   - dialogue.py: Uses Cutscene class and collision_cutscenes data.
+#   - dialogue.py: Uses Cutscene class and collision cutscene data (get_cutscene).
 
 import pygame
 import pytmx # For loading Tiled map files (.tmx)
 import pyscroll # For rendering Tiled maps efficiently
 from pytmx.util_pygame import load_pygame # Pygame-specific Tiled loader utility
-from typing import Optional, Dict, List # Used for type hinting
+from typing import Optional, Dict, List, Tuple # Used for type hinting
 import os # Needed for checking music file existence
 import traceback # For better error reporting
 
 
 # Import necessary classes/data from dialogue.py
-from dialogue import Dialogue, DialogueBox, dialogues, Cutscene, collision_cutscenes, render_textrect, TextRectException
+from dialogue import Dialogue, DialogueBox, get_dialogue, Cutscene, get_cutscene, prerender_dialogues, prerender_cutscenes, preload_cutscene_images, render_textrect, TextRectException
 
 # Import from our custom modules
 import config  # Game configuration variables
@@ -54,6 +54,8 @@ class Game:
         self.tmx_data: Optional[pytmx.TiledMap] = None
         self.map_layer: Optional[pyscroll.BufferedRenderer] = None
         self.group: Optional[pyscroll.PyscrollGroup] = None
+        # Parsed maps and their renderers by map key, so walking back to a map doesn't re-read the TMX
+        self._map_cache: Dict[str, Tuple[pytmx.TiledMap, pyscroll.BufferedRenderer]] = {}
         # Keep track of the last tile's properties for event triggering
         self.last_event_tile_properties: Optional[Dict] = None
 
@@ -79,6 +81,7 @@ class Game:
         self.active_dialogue: Optional[Dialogue] = None
         self.dialogue_box: Optional[DialogueBox] = None # Use a single box, update its text
         self.interact_prompt_surf: Optional[pygame.Surface] = None # Surface for "Press E"
+        self.interactable_npcs: List[pygame.sprite.Sprite] = [] # NPCs with dialogue on the current map (rebuilt in load_map)
 
         # --- Pier Repair State Variables Removed ---
         # --- Font Initialization ---
@@ -107,6 +110,10 @@ class Game:
         except pygame.error as e:
             print(f"Error initializing funds font '{funds_font_name}': {e}. Using default UI font.") # Fallback size will also be larger now
             self.funds_font = pygame.font.Font(None, 30) # Ensure fallback on error
+            # The funds font failed before these were created, so create them here too
+            self.cutscene_font = pygame.font.Font(None, 30)
+            self.epilogue_font = pygame.font.Font(None, 42)
+            self.epilogue_title_font = pygame.font.Font(None, 84)
         except Exception as e: # Catch other potential font loading errors
             print(f"Error initializing fonts: {e}")
             self.ui_font = None
@@ -164,6 +171,14 @@ class Game:
             print("CRITICAL: Cannot create DialogueBox because ui_font failed to load.")
             self.running = False # Stop if font is missing
 
+        # --- Pre-render Dialogue and Cutscene Text, Pre-load Cutscene Images ---
+        # All of it is static, so render it once now rather than when an NPC or cutscene first shows it
+        if self.dialogue_box:
+            prerender_dialogues(self.dialogue_box)
+        if self.cutscene_font:
+            prerender_cutscenes(self.cutscene_font, self._cutscene_text_render_rect(), config.WHITE)
+        preload_cutscene_images((config.SCREEN_WIDTH, config.SCREEN_HEIGHT)) # Decode slide images now too
+
         # --- Intro Screen Assets ---
         self.intro_background: Optional[pygame.Surface] = None
         self.title_surf: Optional[pygame.Surface] = None
@@ -238,8 +253,8 @@ class Game:
 
             # --- Load Ending Images (Side-by-Side) ---
             image_paths = [
-                f"{config.IMAGES_DIR}/ending_background1.jpeg",
-                f"{config.IMAGES_DIR}/ending_background2.jpg"
+                os.path.join(config.IMAGES_DIR, "ending_background1.jpeg"),
+                os.path.join(config.IMAGES_DIR, "ending_background2.jpg")
             ]
             image_surfaces = [None, None] # To store loaded/scaled surfaces
             image_rects = [None, None]   # To store final positions
@@ -327,14 +342,20 @@ class Game:
             if map_key not in config.MAP_PATHS:
                 raise ValueError(f"Map key '{map_key}' not found in config.MAP_PATHS")
 
-            map_path = config.MAP_PATHS[map_key]
-            self.tmx_data = load_pygame(map_path)
-            map_data = pyscroll.TiledMapData(self.tmx_data)
+            # Parse the map and build its renderer only on the first visit; the renderer keeps
+            # its tile buffer in step with its own view, so it can be reused as-is on later visits
+            cached_map = self._map_cache.get(map_key)
+            if cached_map is None:
+                map_path = config.MAP_PATHS[map_key]
+                tmx_data = load_pygame(map_path)
+                map_data = pyscroll.TiledMapData(tmx_data)
 
-            self.map_layer = pyscroll.BufferedRenderer(
-                map_data, (config.SCREEN_WIDTH, config.SCREEN_HEIGHT), clamp_camera=True, alpha=True # Use game_surface size
-            )
-            self.map_layer.zoom = config.ZOOM_LEVEL
+                map_layer = pyscroll.BufferedRenderer(
+                    map_data, (config.SCREEN_WIDTH, config.SCREEN_HEIGHT), clamp_camera=True, alpha=True # Use game_surface size
+                )
+                map_layer.zoom = config.ZOOM_LEVEL
+                cached_map = self._map_cache[map_key] = (tmx_data, map_layer)
+            self.tmx_data, self.map_layer = cached_map
 
             self.group = pyscroll.PyscrollGroup(
                 map_layer=self.map_layer, default_layer=config.DEFAULT_LAYER
@@ -347,10 +368,6 @@ class Game:
             # Reset last tile properties
             self.last_event_tile_properties = None
 
-            # --- Recreate Renderer (No special pier logic needed here anymore) ---
-            self.map_layer = pyscroll.BufferedRenderer(map_data, (config.SCREEN_WIDTH, config.SCREEN_HEIGHT), clamp_camera=True, alpha=True) # Use game_surface size
-            self.map_layer.zoom = config.ZOOM_LEVEL
-
             # --- Add Player ---
             self.group.add(self.player)
 
@@ -387,8 +404,12 @@ class Game:
                     self.group.add(self.houseowners[i])
                     print(f"  Added Houseowner {i} at {pos}")
 
-            # Update the group's map layer reference
-            self.group.map_layer = self.map_layer
+            # Remember which sprites can be talked to, so the per-frame proximity check
+            # doesn't have to filter every sprite in the group each time
+            self.interactable_npcs = [
+                sprite for sprite in self.group.sprites()
+                if isinstance(sprite, (sprites.Piermaster, sprites.Mayor, sprites.Houseowner)) and hasattr(sprite, 'dialogue_key')
+            ]
 
             self.current_map_key = map_key
             print(f"Map '{map_key}' loaded successfully.")
@@ -491,13 +512,13 @@ class Game:
                 # -------------------------------------------------
 
                 # Check if the cutscene exists and hasn't been played on this map load
-                if current_trigger_key in collision_cutscenes and current_trigger_key not in self.triggered_cutscenes:
+                if get_cutscene(current_trigger_key) is not None and current_trigger_key not in self.triggered_cutscenes:
                     self.start_cutscene(current_trigger_key) # Start the cutscene
                 # ... rest of the logic ...
 
                 elif current_trigger_key in self.triggered_cutscenes:
                      print(f"  Cutscene '{current_trigger_key}' already triggered on this map load.")
-                elif current_trigger_key not in collision_cutscenes:
+                elif get_cutscene(current_trigger_key) is None:
                      print(f"  Warning: Tile has CutsceneTrigger '{current_trigger_key}', but no matching cutscene found in dialogue.py.")
 
             # --- Update the last known properties for the next frame ---
@@ -508,20 +529,19 @@ class Game:
         if not self.player or not self.group:
             return None
 
-        player_pos = pygame.Vector2(self.player.hitbox.center)
+        player_x, player_y = self.player.hitbox.center
         closest_npc = None
         min_dist_sq = config.INTERACTION_DISTANCE ** 2 # Use squared distance for efficiency
 
-        # Iterate through sprites in the group that are NPCs and have dialogue
-        for sprite in self.group.sprites():
-            # Check if it's an NPC instance we care about and has a dialogue key
-            if isinstance(sprite, (sprites.Piermaster, sprites.Mayor, sprites.Houseowner)) and hasattr(sprite, 'dialogue_key'):
-                npc_pos = pygame.Vector2(sprite.rect.center)
-                dist_sq = player_pos.distance_squared_to(npc_pos)
+        # Only NPCs with dialogue on this map are checked (list is built in load_map).
+        # Plain integer maths: this runs every frame, so avoid allocating Vector2s.
+        for npc in self.interactable_npcs:
+            npc_x, npc_y = npc.rect.center
+            dist_sq = (npc_x - player_x) ** 2 + (npc_y - player_y) ** 2
 
-                if dist_sq < min_dist_sq:
-                    min_dist_sq = dist_sq
-                    closest_npc = sprite
+            if dist_sq < min_dist_sq:
+                min_dist_sq = dist_sq
+                closest_npc = npc
 
         return closest_npc
 
@@ -531,12 +551,13 @@ class Game:
             return # Can only start dialogue from playing state with a valid NPC
 
         dialogue_key = npc.dialogue_key
-        if dialogue_key in dialogues:
-            self.active_dialogue = dialogues[dialogue_key]
+        dialogue = get_dialogue(dialogue_key)
+        if dialogue is not None:
+            self.active_dialogue = dialogue
             self.active_dialogue.reset() # Start from the first line
             first_line = self.active_dialogue.get_current_line()
             if first_line and self.dialogue_box:
-                self.dialogue_box.update_text(f"{self.active_dialogue.name}: {first_line}")
+                self.dialogue_box.show_dialogue_line(self.active_dialogue) # Rendered once, then kept on the Dialogue
                 self.dialogue_box.show()
                 self.game_state = 'dialogue' # Change game state
                 print(f"Starting dialogue: {dialogue_key}")
@@ -601,9 +622,10 @@ class Game:
             print("Warning: Tried to start a cutscene while one is already active.")
             return # Don't start a new one if already in a cutscene
 
-        if cutscene_key in collision_cutscenes:
+        cutscene = get_cutscene(cutscene_key)
+        if cutscene is not None:
             print(f"Starting cutscene: {cutscene_key}")
-            self.active_cutscene = collision_cutscenes[cutscene_key]
+            self.active_cutscene = cutscene
             self.current_cutscene_slide = 0
             self.game_state = 'cutscene'
             self.triggered_cutscenes.add(cutscene_key) # Mark as played for this map load
@@ -630,11 +652,36 @@ class Game:
                 print("Cutscene has no associated music.")
             # --------------------
 
+            # Decode and scale every slide image and render every sentence now, so advancing slides is just a blit
+            self.active_cutscene.preload((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+            if self.cutscene_font:
+                try:
+                    self.active_cutscene.preshape(self.cutscene_font, self._cutscene_text_render_rect(), config.WHITE)
+                except Exception as e:
+                    print(f"Warning: Could not preshape cutscene text: {e}") # Slides render their text one at a time instead
             self._load_cutscene_slide() # Load the first slide's assets
         else:
             # This case should be less likely now as the check happens in check_tile_events
             print(f"Error: Attempted to start unknown cutscene key: {cutscene_key}")
 
+    def _cutscene_text_bg_rect(self) -> pygame.Rect:
+        """Returns the rect of the cutscene text box, relative to game_surface."""
+        text_margin = 50
+        text_box_height = 150
+        return pygame.Rect(
+            text_margin, # Position relative to game_surface
+            config.SCREEN_HEIGHT - text_box_height - text_margin,
+            config.SCREEN_WIDTH - (text_margin * 2),
+            text_box_height # Use config dimensions
+        )
+
+    def _cutscene_text_render_rect(self) -> pygame.Rect:
+        """Returns the area *inside* the cutscene text box (within its padding) that text is rendered into."""
+        text_bg_rect = self._cutscene_text_bg_rect()
+        text_render_area_width = text_bg_rect.width - (self.cutscene_text_padding * 2)
+        text_render_area_height = text_bg_rect.height - (self.cutscene_text_padding * 2)
+        return pygame.Rect(0, 0, text_render_area_width, text_render_area_height)
+
     def _load_cutscene_slide(self) -> None:
         """Loads the image and renders the text for the current cutscene slide."""
         if not self.active_cutscene or not self.cutscene_font:
@@ -648,10 +695,9 @@ class Game:
             self.cutscene_image_surface = None # Reset previous image
             if image_path:
                 try:
-                    loaded_image = pygame.image.load(image_path).convert() # Use convert() if no alpha needed for background
-                    # Scale the image to fit the entire screen
-                    self.cutscene_image_surface = pygame.transform.smoothscale(
-                        loaded_image, (config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
+                    # Already scaled to fit the entire screen (cached by Cutscene.preload)
+                    self.cutscene_image_surface = self.active_cutscene.get_image(
+                        slide_index, (config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
                     )
                 except pygame.error as e:
                     print(f"Error loading/scaling cutscene image '{image_path}': {e}")
@@ -674,31 +720,26 @@ class Game:
             self.cutscene_text_surface = None # Reset previous text
             self.cutscene_text_bg_rect = None # Reset background rect
             if text:
-                text_margin = 50
-                text_box_height = 150
                 # 1. Define the visual background box rectangle
-                self.cutscene_text_bg_rect = pygame.Rect(
-                    text_margin, # Position relative to game_surface
-                    config.SCREEN_HEIGHT - text_box_height - text_margin,
-                    config.SCREEN_WIDTH - (text_margin * 2),
-                    text_box_height # Use config dimensions
-                )
+                self.cutscene_text_bg_rect = self._cutscene_text_bg_rect()
 
                 # 2. Define the area *inside* the box for text rendering
-                text_render_area_width = self.cutscene_text_bg_rect.width - (self.cutscene_text_padding * 2)
-                text_render_area_height = self.cutscene_text_bg_rect.height - (self.cutscene_text_padding * 2)
-                text_render_rect = pygame.Rect(0, 0, text_render_area_width, text_render_area_height)
+                text_render_rect = self._cutscene_text_render_rect()
+
+                # 3. Use the surface rendered by Cutscene.preshape, if there is one
+                self.cutscene_text_surface = self.active_cutscene.get_text_surface(slide_index)
 
                 try:
-                    # 3. Render *only* the text with a transparent background
-                    self.cutscene_text_surface = render_textrect(
-                        text,
-                        self.cutscene_font, # Font object
-                        text_render_rect,   # The rectangle for the text area
-                        config.WHITE,
-                        (0, 0, 0, 0), # Transparent background for the text surface
-                        justification=0
-                    )
+                    # Otherwise render *only* the text with a transparent background
+                    if self.cutscene_text_surface is None:
+                        self.cutscene_text_surface = render_textrect(
+                            text,
+                            self.cutscene_font, # Font object
+                            text_render_rect,   # The rectangle for the text area
+                            config.WHITE,
+                            (0, 0, 0, 0), # Transparent background for the text surface
+                            justification=0
+                        )
                 except TextRectException as e:
                     print(f"Error rendering cutscene text: {e}")
                     self.cutscene_text_surface = self.cutscene_font.render("Text Error", True, config.WHITE, config.DARK_GRAY)
@@ -858,13 +899,13 @@ class Game:
                          print("Advancing dialogue...")
                          next_line = self.active_dialogue.next_line()
                          if next_line:
-                             self.dialogue_box.update_text(f"{self.active_dialogue.name}: {next_line}")
+                             self.dialogue_box.show_dialogue_line(self.active_dialogue)
                          else:
                              # Dialogue finished
                              print("Dialogue finished.")
                              self.dialogue_box.hide()
                              # Check if it was the Piermaster's ENDING dialogue
-                             if self.active_dialogue == dialogues.get("piermaster_ending"):
+                             if self.active_dialogue is get_dialogue("piermaster_ending"):
                                  self.game_state = 'ending' # <<< TRANSITION TO ENDING
                              else:
                                  self.game_state = 'playing' # Return to gameplay
@@ -932,7 +973,8 @@ class Game:
         if self.game_state == 'playing':
             if self.group:
                 # Update sprites (includes player movement, passing dt)
-                self.group.update(dt) # Pass delta time to sprites that might need it
+                # Read the keyboard once per frame and hand it to every sprite
+                self.group.update(dt, keys=pygame.key.get_pressed()) # Pass delta time to sprites that might need it
                 # Center camera on player
                 self.group.center(self.player.rect.center)
                 # Check for tile-based events (including cutscene triggers)
@@ -1045,9 +1087,8 @@ class Game:
 
             # 1. Draw the fullscreen background image first
             if self.cutscene_image_surface:
-                # Scale image to game_surface size (it was previously scaled to screen size)
-                scaled_cutscene_img = pygame.transform.smoothscale(self.cutscene_image_surface, (config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
-                self.game_surface.blit(scaled_cutscene_img, (0, 0))
+                # Already game_surface size (scaled once when the slide was loaded)
+                self.game_surface.blit(self.cutscene_image_surface, (0, 0))
             else:
                 # Fallback if image surface somehow wasn't created
                 self.game_surface.fill(config.BLACK)
@@ -1078,7 +1119,7 @@ class Game:
             if self.group and self.map_layer:
                 self.group.draw(self.game_surface) # Draw map and sprites to game_surface
             if self.dialogue_box:
-                self.dialogue_box.draw(self.game_surface) # Draw dialogue box on top
+                DialogueBox.draw_all(self.game_surface) # Draw the shown dialogue box(es) on top
 
         elif self.game_state == 'intro':
             # --- Draw Intro Screen ---
@@ -1153,7 +1194,7 @@ def main() -> None:
     # --- Set the Window Icon ---
     try:
         # Construct the full path to the icon using config
-        icon_path = f"{config.IMAGES_DIR}/game_icon.png" # Or your actual icon filename
+        icon_path = os.path.join(config.IMAGES_DIR, "game_icon.png") # Or your actual icon filename
         if os.path.exists(icon_path):
             icon_surface = pygame.image.load(icon_path)
             pygame.display.set_icon(icon_surface)
@@ -47,41 +47,39 @@ class Player(pygame.sprite.Sprite):
         # Set the player's movement speed from the config file
         self.speed = config.PLAYER_SPEED
 
-    def update(self, *args, **kwargs) -> None:
+        # Precompute the per-frame movement for every combination of arrow keys, indexed by
+        # (dx + 1) * 3 + (dy + 1) with dx, dy in {-1, 0, 1}. Diagonals are already normalised
+        # and every entry is already rounded to whole pixels, so update() is a single lookup.
+        # Rebuild this table if self.speed is changed.
+        self._moves = []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                factor = config.PLAYER_DIAGONAL_SPEED_FACTOR if dx and dy else 1
+                self._moves.append((round(dx * factor * self.speed), round(dy * factor * self.speed)))
+
+    def update(self, *args, keys=None, **kwargs) -> None:
         """
         Updates the player's state each frame.
         Currently handles movement based on arrow key presses.
         Normalizes diagonal movement speed to prevent faster diagonal movement.
+
+        Args:
+            keys: The frame's pygame.key.get_pressed() state, if the caller already has it.
         """
-        # Get the state of all keyboard keys
-        keys = pygame.key.get_pressed()
-        # Initialize movement vectors (delta x, delta y) as floats for precision
-        dx, dy = 0.0, 0.0
+        # Get the state of all keyboard keys, unless it was passed in
+        if keys is None:
+            keys = pygame.key.get_pressed()
 
         # --- Calculate movement direction based on pressed keys ---
-        if keys[pygame.K_RIGHT]:
-            dx += 1 # Move right
-        if keys[pygame.K_LEFT]:
-            dx -= 1 # Move left
-        if keys[pygame.K_DOWN]:
-            dy += 1 # Move down
-        if keys[pygame.K_UP]:
-            dy -= 1 # Move up
-
-        # --- Normalize diagonal movement ---
-        # If moving both horizontally and vertically, reduce speed along each axis
-        if dx != 0 and dy != 0:
-            # Multiply by the diagonal factor (1/sqrt(2)) from config
-            dx *= config.PLAYER_DIAGONAL_SPEED_FACTOR
-            dy *= config.PLAYER_DIAGONAL_SPEED_FACTOR
-
-        # --- Apply speed and update position ---
-        # Calculate the final movement amount for this frame
-        move_x = round(dx * self.speed)
-        move_y = round(dy * self.speed)
+        # Opposite keys cancel out, leaving -1, 0 or 1 on each axis
+        dx = keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]
+        dy = keys[pygame.K_DOWN] - keys[pygame.K_UP]
+
+        # --- Look up the movement for this frame ---
+        # Speed and diagonal normalisation are already applied (see __init__)
+        move_x, move_y = self._moves[(dx + 1) * 3 + (dy + 1)]
 
         # Move the player's main rectangle (visual representation) in place
-        # round() converts the potentially fractional movement back to integer pixels
         self.rect.move_ip(move_x, move_y)
 
         # Keep the hitbox centered on the player's visual rectangle after moving
@@ -4,12 +4,8 @@
 # Description: Contains UI element classes like Buttons.
 
 import pygame
-import os
 from typing import Tuple, Optional
 
-# Assuming config.py defines colors like WHITE, BLACK etc.
-import config
-
 class Button:
     """A clickable button UI element."""
 